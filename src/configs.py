@@ -1,13 +1,37 @@
 import argparse
+import atexit
+import functools
 import logging
-from logging.handlers import RotatingFileHandler
+import os
+import socket
+import threading
+import time
+import traceback
+from logging.handlers import (
+    MemoryHandler, QueueHandler, QueueListener, RotatingFileHandler
+)
+from queue import Queue
 from typing import List
 
-from constants import BASE_DIR
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util import Retry, make_headers
+
+from constants import BASE_DIR, MAX_WORKERS
 
 
 LOG_FORMAT = '"%(asctime)s - [%(levelname)s] - %(message)s"'
 DT_FORMAT = '%d.%m.%Y %H:%M:%S'
+LOG_BUFFER_CAPACITY = 4096
+CACHE_EXPIRE_AFTER = 24 * 60 * 60
+USER_AGENT = 'bs4_parser/1.0'
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.3
+RETRY_STATUS_FORCELIST = (429, 500, 502, 503, 504)
+RETRY_ALLOWED_METHODS = frozenset(('GET', 'HEAD'))
+DNS_CACHE_TTL = 300
+DNS_CACHE_MAX_SIZE = 128
+LOGGING_DIR = os.path.dirname(logging.__file__)
 
 
 def configure_argument_parser(
@@ -44,11 +68,41 @@ def configure_argument_parser(
     return parser
 
 
+class StackInfoFilter(logging.Filter):
+    """
+    Attach the call stack to error records when debugging.
+
+    The stack is only captured for records that reached a handler and
+    only while their logger is enabled for DEBUG, so at the default
+    level errors are logged without walking the stack. Frames of the
+    logging machinery itself are left out.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if (
+            record.levelno >= logging.ERROR and not record.stack_info
+            and logging.getLogger(record.name).isEnabledFor(logging.DEBUG)
+        ):
+            frames = [
+                frame for frame in traceback.extract_stack()
+                if not frame.filename.startswith(LOGGING_DIR)
+                and frame.filename != __file__
+            ]
+            record.stack_info = 'Stack (most recent call last):\n' + ''.join(
+                traceback.format_list(frames)
+            ).rstrip('\n')
+        return True
+
+
 def configure_logging() -> None:
     """
     Set up logging with file rotation,
     storing logs in a directory within BASE_DIR.
-    Creates a rotating file handler for logging, managing file size and count.
+    Records are put on a queue and written by a background listener thread,
+    so logging never blocks the parser. File writes are buffered and flushed
+    every LOG_BUFFER_CAPACITY records, on errors and at exit. When debugging,
+    error records get the call stack of the code that logged them, see
+    StackInfoFilter.
     """
     log_dir = BASE_DIR / 'logs'
     log_dir.mkdir(exist_ok=True)
@@ -57,9 +111,132 @@ def configure_logging() -> None:
     rotating_handler = RotatingFileHandler(
         log_file, maxBytes=10 ** 6, backupCount=5
     )
+    buffered_handler = MemoryHandler(
+        LOG_BUFFER_CAPACITY,
+        flushLevel=logging.ERROR,
+        target=rotating_handler
+    )
+    log_queue = Queue(-1)
+    listener = QueueListener(
+        log_queue, buffered_handler, logging.StreamHandler()
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    # The filter runs in the logging thread, where the stack is still
+    # the caller's, not in the listener thread.
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(StackInfoFilter())
     logging.basicConfig(
         datefmt=DT_FORMAT,
         format=LOG_FORMAT,
         level=logging.INFO,
-        handlers=[rotating_handler, logging.StreamHandler()]
+        handlers=[queue_handler]
+    )
+
+
+def configure_http_adapter() -> HTTPAdapter:
+    """
+    Create an HTTP adapter with a keep-alive pool large enough
+    for MAX_WORKERS concurrent requests. Idempotent requests are retried
+    with backoff on connection errors and on rate limiting or transient
+    server errors; the last response is returned if retries run out.
+    Requests beyond the pool size wait for a free pooled connection
+    instead of opening one-off connections that are closed afterwards.
+
+    Returns:
+        HTTPAdapter: Configured adapter object.
+    """
+    return HTTPAdapter(
+        pool_connections=MAX_WORKERS,
+        pool_maxsize=MAX_WORKERS,
+        pool_block=True,
+        max_retries=Retry(
+            total=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS_FORCELIST,
+            allowed_methods=RETRY_ALLOWED_METHODS,
+            raise_on_status=False
+        )
+    )
+
+
+def configure_dns_cache() -> None:
+    """
+    Cache successful host name lookups for DNS_CACHE_TTL seconds.
+
+    Wraps socket.getaddrinfo once per process, and the wrapper stays in
+    place for the life of the process. Lookups of the same host are
+    serialised, so worker threads opening pooled connections to it at
+    once resolve it a single time instead of once per connection.
+    Lookups of different hosts never wait for each other. Expired entries
+    are refreshed in place, and once DNS_CACHE_MAX_SIZE lookups are
+    cached, new ones are resolved without being cached.
+    """
+    if getattr(socket.getaddrinfo, 'is_cached', False):
+        return
+    resolve = socket.getaddrinfo
+    cache = {}
+    not_cached = (float('-inf'), None)
+    key_locks = {}
+    key_locks_lock = threading.Lock()
+
+    @functools.wraps(resolve)
+    def cached_getaddrinfo(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        expires_at, addresses = cache.get(key, not_cached)
+        if expires_at >= time.monotonic():
+            return addresses
+        with key_locks_lock:
+            key_lock = key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            expires_at, addresses = cache.get(key, not_cached)
+            if expires_at < time.monotonic():
+                try:
+                    addresses = resolve(*args, **kwargs)
+                    if key in cache or len(cache) < DNS_CACHE_MAX_SIZE:
+                        cache[key] = (
+                            time.monotonic() + DNS_CACHE_TTL, addresses
+                        )
+                finally:
+                    with key_locks_lock:
+                        key_locks.pop(key, None)
+        return addresses
+
+    cached_getaddrinfo.is_cached = True
+    socket.getaddrinfo = cached_getaddrinfo
+
+
+def configure_session() -> CachedSession:
+    """
+    Create a caching session that reuses pooled connections for
+    both HTTP and HTTPS requests. The SQLite cache runs in write-ahead
+    logging mode, so concurrent reads from worker threads do not block
+    on cache writes. Responses honour the server's Cache-Control headers,
+    fall back to CACHE_EXPIRE_AFTER seconds and are revalidated with
+    conditional requests once expired. Stale responses are reused if
+    the server is unreachable. Pages are requested compressed with every
+    encoding urllib3 can decode, including Brotli when it is installed.
+    Host name lookups are cached, see configure_dns_cache.
+
+    Returns:
+        CachedSession: Configured session object.
+    """
+    configure_dns_cache()
+    session = CachedSession(
+        backend='sqlite',
+        wal=True,
+        cache_control=True,
+        expire_after=CACHE_EXPIRE_AFTER,
+        stale_if_error=True
     )
+    session.headers.update({
+        'Accept-Encoding': make_headers(accept_encoding=True)[
+            'accept-encoding'
+        ],
+        'User-Agent': USER_AGENT,
+    })
+    adapter = configure_http_adapter()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
@@ -3,6 +3,11 @@ from pathlib import Path
 MAIN_DOC_URL = 'https://docs.python.org/3/'
 PEP_DOC_URL = 'https://peps.python.org/'
 BASE_DIR = Path(__file__).parent
+MAX_WORKERS = 32
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+STREAM_CHUNK_SIZE = 1 << 14
+REQUEST_TIMEOUT = (5, 30)
+DEFAULT_ENCODING = 'utf-8'
 EXPECTED_STATUS = {
     'A': ('Active', 'Accepted'),
     'D': ('Deferred',),
@@ -7,3 +7,14 @@ class ParserFindTagException(Exception):
     """
 
     pass
+
+
+class FetchError(Exception):
+    """
+    Exception for when a page can't be loaded.
+
+    Raised after the session has used up its retries, so callers can
+    rely on a successful response instead of checking for None.
+    """
+
+    pass
@@ -1,65 +1,132 @@
 import logging
 import re
-from collections import defaultdict
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import List, Optional, Tuple
 from urllib.parse import urljoin
 
-import requests_cache
-from bs4 import BeautifulSoup
+from bs4 import Tag
+from lxml import etree
+from requests import Response
 from requests_cache import CachedSession
 from tqdm import tqdm
 
-from configs import configure_argument_parser, configure_logging
-from constants import BASE_DIR, EXPECTED_STATUS, MAIN_DOC_URL, PEP_DOC_URL
+from configs import (
+    configure_argument_parser, configure_logging, configure_session
+)
+from constants import (
+    BASE_DIR, EXPECTED_STATUS, MAIN_DOC_URL, MAX_WORKERS, PEP_DOC_URL
+)
+from exceptions import FetchError, ParserFindTagException
 from outputs import control_output
-from utils import find_tag, get_response
+from utils import (
+    download_file, find_by_xpath, find_element, find_tag, get_charset,
+    get_response, get_responses, iter_parse, join_url, make_tree,
+    parse_and_find
+)
+
+VERSION_PATTERN = re.compile(
+    r'Python (?P<version>\d\.\d+) \((?P<status>.*)\)'
+)
+PDF_A4_PATTERN = re.compile(r'.+pdf-a4\.zip$')
+# disable=None hides progress bars when stderr is not a terminal.
+PROGRESS_BAR_OPTIONS = {'mininterval': 0.5, 'disable': None}
+PEP_PROGRESS_MINITERS = 100
+PEP_ROWS_XPATH = (
+    '//section[@id="numerical-index"]//table/tbody/tr[td/abbr and .//a]'
+)
+PEP_LISTED_STATUS_XPATH = etree.XPath('string(./td/abbr)')
+PEP_LINK_XPATH = etree.XPath('string(.//a[1]/@href)')
+
+
+def parse_whats_new_page(
+        version_link: str, response: Response
+) -> Tuple[str, str, str]:
+    """
+    Extract the summary of a single "What's New" article.
+
+    Args:
+        version_link (str): Link to the article.
+        response (Response): Response with the article page.
+
+    Returns:
+        Tuple with article link, title and editor and author info.
+    """
+    tree = make_tree(response.content, get_charset(response))
+    h1 = find_element(tree, 'h1')
+    dl = find_element(tree, 'dl')
+    dl_text = dl.text_content().replace('\n', ' ')
+    return version_link, h1.text_content(), dl_text
 
 
 def whats_new(session: CachedSession) -> List[Tuple[str, str, str]]:
     """
     Fetch a list of Python's new features from the official website.
 
+    Article pages are fetched concurrently by a pool of MAX_WORKERS threads,
+    and articles that fail to load are left out.
+
     Args:
         session (CachedSession): Session object with caching for HTTP requests.
 
     Returns:
         List of tuples with new feature information
         (article link, title, editor and author info).
+
+    Raises:
+        FetchError: If the index of articles can not be loaded.
     """
     whats_new_url = urljoin(MAIN_DOC_URL, 'whatsnew/')
     response = get_response(session, whats_new_url)
-    if response is None:
-        return
-    soup = BeautifulSoup(response.text, features='lxml')
-
-    main_div = find_tag(soup, 'section', attrs={'id': 'what-s-new-in-python'})
+    main_div = parse_and_find(
+        response, 'section', attrs={'id': 'what-s-new-in-python'}
+    )
     div_with_ul = find_tag(main_div, 'div', attrs={'class': 'toctree-wrapper'})
     sections_by_python = div_with_ul.find_all(
         'li', attrs={'class': 'toctree-l1'}
     )
-
-    results = [('Article link', 'Title', 'Editor, Author')]
-
-    for section in tqdm(sections_by_python):
-        version_a_tag = find_tag(section, 'a')
-        version_link = urljoin(whats_new_url, version_a_tag['href'])
-        response = get_response(session, version_link)
-        if response is None:
-            continue
-        soup = BeautifulSoup(response.text, 'lxml')
-        h1 = find_tag(soup, 'h1')
-        dl = find_tag(soup, 'dl')
-        dl_text = dl.text.replace('\n', ' ')
-        results.append(
-            (version_link, h1.text, dl_text)
+    version_links = [
+        join_url(whats_new_url, find_tag(section, 'a')['href'])
+        for section in sections_by_python
+    ]
+
+    responses = tqdm(
+        get_responses(session, version_links),
+        total=len(version_links),
+        **PROGRESS_BAR_OPTIONS
+    )
+    return [
+        ('Article link', 'Title', 'Editor, Author'),
+        *(
+            parse_whats_new_page(version_link, response)
+            for version_link, response in zip(version_links, responses)
+            if response is not None
         )
+    ]
 
-    return results
+
+def parse_version_link(a_tag: Tag) -> Tuple[str, str, str]:
+    """
+    Extract documentation link, version and status from a sidebar link.
+
+    Args:
+        a_tag (Tag): Link to the documentation of one Python version.
+
+    Returns:
+        Tuple with documentation link, version and status. Links that do
+        not name a version keep their text as version and an empty status.
+    """
+    text_match = VERSION_PATTERN.search(a_tag.text)
+    if text_match is None:
+        return a_tag['href'], a_tag.text, ''
+    version, status = text_match.groups()
+    return a_tag['href'], version, status
 
 
 def latest_versions(
         session: CachedSession
-) -> Optional[List[Tuple[str, str, str]]]:
+) -> List[Tuple[str, str, str]]:
     """
     Extract the latest Python versions from the official website.
 
@@ -68,14 +135,15 @@ def latest_versions(
 
     Returns:
         List of tuples with the latest version information
-        (documentation link, version, status), or None if unable to fetch.
+        (documentation link, version, status).
+
+    Raises:
+        FetchError: If the documentation page can not be loaded.
     """
     response = get_response(session, MAIN_DOC_URL)
-    if response is None:
-        return
-    soup = BeautifulSoup(response.text, features='lxml')
-
-    sidebar = find_tag(soup, 'div', {'class': 'sphinxsidebarwrapper'})
+    sidebar = parse_and_find(
+        response, 'div', {'class': 'sphinxsidebarwrapper'}
+    )
     ul_tags = sidebar.find_all('ul')
 
     for ul in ul_tags:
@@ -85,20 +153,10 @@ def latest_versions(
     else:
         raise Exception('Nothing was found')
 
-    results = [('Documentation link', 'Version', 'Status')]
-    pattern = r'Python (?P<version>\d\.\d+) \((?P<status>.*)\)'
-    for a_tag in a_tags:
-        link = a_tag['href']
-        text_match = re.search(pattern, a_tag.text)
-        if text_match is not None:
-            version, status = text_match.groups()
-        else:
-            version, status = a_tag.text, ''
-        results.append(
-            (link, version, status)
-        )
-
-    return results
+    return [
+        ('Documentation link', 'Version', 'Status'),
+        *(parse_version_link(a_tag) for a_tag in a_tags)
+    ]
 
 
 def download(session: CachedSession) -> None:
@@ -108,7 +166,10 @@ def download(session: CachedSession) -> None:
     This function retrieves the PDF archive of Python's documentation using a
     session with caching enabled. It saves the archive within the 'downloads'
     directory of BASE_DIR. If this directory does not exist, it will be
-    automatically created. Logs the success of the download operation.
+    automatically created. The archive bypasses the HTTP cache and is
+    streamed to disk by download_file, so an interrupted download never
+    leaves a truncated archive behind. Logs the success of the download
+    operation.
 
     Args:
         session (CachedSession): A session object for making HTTP requests
@@ -117,17 +178,16 @@ def download(session: CachedSession) -> None:
     Returns:
         None. The function writes the PDF archive to the filesystem and logs
         the path where the archive is saved but does not return any value.
+
+    Raises:
+        FetchError: If the downloads page or the archive can not be loaded.
     """
     downloads_url = urljoin(MAIN_DOC_URL, 'download.html')
     response = get_response(session, downloads_url)
-    if response is None:
-        return
-    soup = BeautifulSoup(response.text, features='lxml')
-
-    main_tag = find_tag(soup, 'div', {'role': 'main'})
+    main_tag = parse_and_find(response, 'div', {'role': 'main'})
     table_tag = find_tag(main_tag, 'table', {'class': 'docutils'})
     pdf_a4_tag = find_tag(
-        table_tag, 'a', {'href': re.compile(r'.+pdf-a4\.zip$')}
+        table_tag, 'a', {'href': PDF_A4_PATTERN}
     )
     pdf_a4_link = pdf_a4_tag['href']
     archive_url = urljoin(downloads_url, pdf_a4_link)
@@ -137,78 +197,111 @@ def download(session: CachedSession) -> None:
     downloads_dir.mkdir(exist_ok=True)
     archive_path = downloads_dir / filename
 
-    response = session.get(archive_url)
-    if response is None:
-        return
-
-    with open(archive_path, 'wb') as file:
-        file.write(response.content)
+    with session.cache_disabled():
+        download_file(session, archive_url, archive_path)
     logging.info(f'Архив был загружен и сохранён: {archive_path}')
 
 
-def pep(session: CachedSession) -> Optional[List[Tuple[str, int]]]:
+def parse_pep_page(session: CachedSession, pep_url: str) -> Optional[str]:
     """
-    Pars the PEP index for status counts and logs mismatches.
+    Fetch a single PEP page and extract its status from the header.
 
-    Iterates over PEPs, extracts and compares statuses from the index and
-    PEP pages. Tallies status occurrences and logs discrepancies. Returns
-    status counts and total processed PEPs or None if unreachable.
+    The page is parsed incrementally, and parsing stops as soon as the
+    Status field is found, so the rest of the document is never built.
 
     Args:
         session (CachedSession): Session for cached HTTP requests.
+        pep_url (str): Link to the PEP page.
 
     Returns:
-        List of tuples with status counts and total PEPs or None.
+        Status shown on the PEP page or None if the page is unreachable
+        or responds with an error status.
     """
-    response = get_response(session, PEP_DOC_URL)
-    if response is None:
-        return
+    is_status_field = False
+    try:
+        for element in iter_parse(session, pep_url, ('dt', 'dd')):
+            if is_status_field and element.tag == 'dd':
+                return ''.join(element.itertext())
+            is_status_field = (
+                element.tag == 'dt'
+                and (element.text or '').strip() == 'Status'
+            )
+    except FetchError:
+        return None
 
-    soup = BeautifulSoup(response.text, 'lxml')
-    index_section = find_tag(soup, 'section', attrs={'id': 'numerical-index'})
-    peps_table_body = find_tag(index_section, 'tbody')
-    pep_rows = peps_table_body.find_all('tr')
+    error_msg = f'Status not found on {pep_url}'
+    logging.error(error_msg)
+    raise ParserFindTagException(error_msg)
 
-    results = [('Status', 'Count')]
-    status_counter = defaultdict(int)
-    mismatch_log = []
 
-    for pep_row in tqdm(pep_rows, desc="Processing PEPs"):
-        status_abbr = find_tag(pep_row, 'abbr')
-        listed_status = status_abbr.text[1:]
-        pep_link_tag = find_tag(pep_row, 'a')
-        pep_url = urljoin(PEP_DOC_URL, pep_link_tag['href'])
+def pep(session: CachedSession) -> List[Tuple[str, int]]:
+    """
+    Pars the PEP index for status counts and logs mismatches.
 
-        pep_response = get_response(session, pep_url)
-        if pep_response is None:
-            continue
+    Iterates over PEPs, extracts and compares statuses from the index and
+    PEP pages. Each distinct PEP page is fetched once, concurrently by a
+    pool of MAX_WORKERS threads. Tallies status occurrences and logs
+    discrepancies. Returns status counts and total processed PEPs.
 
-        pep_page_soup = BeautifulSoup(pep_response.text, 'lxml')
-        status_section = find_tag(
-            pep_page_soup, 'dl', attrs={'class': 'rfc2822 field-list simple'}
-        )
-        actual_status = (
-            status_section.find(string='Status').find_next('dd').text
-        )
+    Args:
+        session (CachedSession): Session for cached HTTP requests.
 
-        if actual_status not in EXPECTED_STATUS.get(listed_status, []):
-            error_message = (
-                f"Mismatched statuses: {pep_url}"
-                f"Status on page: {actual_status}"
-                f"Expected statuses: {EXPECTED_STATUS.get(listed_status)}"
-            )
-            mismatch_log.append(error_message)
+    Returns:
+        List of tuples with status counts and total PEPs.
 
-        status_counter[actual_status] += 1
+    Raises:
+        FetchError: If the PEP index can not be loaded.
+    """
+    response = get_response(session, PEP_DOC_URL)
 
-    if mismatch_log:
-        logging.info('\n'.join(mismatch_log))
+    tree = make_tree(response.content, get_charset(response))
+    pep_rows = find_by_xpath(tree, PEP_ROWS_XPATH)
 
-    count_peps = sum(status_counter.values())
-    results.extend(status_counter.items())
-    results.append(('Total', count_peps))
+    tasks = [
+        (
+            join_url(PEP_DOC_URL, PEP_LINK_XPATH(pep_row)),
+            PEP_LISTED_STATUS_XPATH(pep_row)[1:]
+        )
+        for pep_row in pep_rows
+    ]
+
+    pep_urls = list(dict.fromkeys(pep_url for pep_url, _ in tasks))
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        statuses_by_url = dict(zip(pep_urls, tqdm(
+            executor.map(partial(parse_pep_page, session), pep_urls),
+            total=len(pep_urls),
+            desc="Processing PEPs",
+            miniters=PEP_PROGRESS_MINITERS,
+            **PROGRESS_BAR_OPTIONS
+        )))
+    actual_statuses = [statuses_by_url[pep_url] for pep_url, _ in tasks]
+
+    status_counter = Counter(
+        actual_status for actual_status in actual_statuses
+        if actual_status is not None
+    )
+    mismatches = [
+        (pep_url, actual_status, EXPECTED_STATUS.get(listed_status))
+        for (pep_url, listed_status), actual_status in zip(
+            tasks, actual_statuses
+        )
+        if actual_status is not None
+        and actual_status not in EXPECTED_STATUS.get(listed_status, [])
+    ]
 
-    return results
+    if mismatches:
+        logging.info('\n'.join(
+            f'Mismatched statuses: {pep_url}\n'
+            f'Status on page: {actual_status}\n'
+            f'Expected statuses: {expected_statuses}'
+            for pep_url, actual_status, expected_statuses in mismatches
+        ))
+
+    return [
+        ('Status', 'Count'),
+        *status_counter.items(),
+        ('Total', sum(status_counter.values()))
+    ]
 
 
 MODE_TO_FUNCTION = {
@@ -228,18 +321,21 @@ def main():
     args = arg_parser.parse_args()
     logging.info(f'Command line arguments {args}')
 
-    session = requests_cache.CachedSession()
+    session = configure_session()
     if args.clear_cache:
         session.cache.clear()
 
     parser_mode = args.mode
-    results = MODE_TO_FUNCTION[parser_mode](session)
+    try:
+        results = MODE_TO_FUNCTION[parser_mode](session)
+    except FetchError:
+        # get_response has already logged the failure.
+        return
 
     if results is not None:
         control_output(results, args)
     logging.info('Parser finished successfully')
 
 
-
 if __name__ == '__main__':
     main()
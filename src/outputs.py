@@ -1,14 +1,15 @@
 import csv
 import datetime as dt
 import logging
+import sys
+from io import StringIO
 from typing import List, Tuple, Any, Optional
 
-from prettytable import PrettyTable
-
 from constants import BASE_DIR
 
 
 DATETIME_FORMAT = '%Y-%m-%d_%H-%M-%S'
+FILE_BUFFER_SIZE = 1 << 20
 
 
 def control_output(results: List[Tuple[Any, ...]],
@@ -42,16 +43,30 @@ def default_output(results: List[Tuple[Any, ...]]) -> None:
 
 def pretty_output(results: List[Tuple[Any, ...]]) -> None:
     """
-    Print results in a formatted table using PrettyTable.
+    Print results in a left-aligned bordered table.
+
+    Column widths are computed in one pass and the whole table is
+    written to the console with a single call.
 
     Args:
         results: The results to print in a table.
     """
-    table = PrettyTable()
-    table.field_names = results[0]
-    table.align = 'l'
-    table.add_rows(results[1:])
-    print(table)
+    rows = [[str(value) for value in row] for row in results]
+    widths = [max(map(len, column)) for column in zip(*rows)]
+    border = '+' + '+'.join('-' * (width + 2) for width in widths) + '+\n'
+
+    table = StringIO()
+    table.write(border)
+    for index, row in enumerate(rows):
+        table.write('| ')
+        table.write(' | '.join(
+            value.ljust(width) for value, width in zip(row, widths)
+        ))
+        table.write(' |\n')
+        if index == 0:
+            table.write(border)
+    table.write(border)
+    sys.stdout.write(table.getvalue())
 
 
 def file_output(results: List[Tuple[Any, ...]],
@@ -70,7 +85,10 @@ def file_output(results: List[Tuple[Any, ...]],
     now_formatted = now.strftime(DATETIME_FORMAT)
     file_name = f'{parser_mode}_{now_formatted}.csv'
     file_path = results_dir / file_name
-    with open(file_path, 'w', encoding='utf-8') as f:
+    with open(
+            file_path, 'w', encoding='utf-8', newline='',
+            buffering=FILE_BUFFER_SIZE
+    ) as f:
         writer = csv.writer(f, dialect='unix')
         writer.writerows(results)
     logging.info(f'Results file was saved: {file_path}')
@@ -1,33 +1,388 @@
+import codecs
 import logging
-from typing import Optional, Any, Dict
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.message import Message
+from pathlib import Path
+from functools import lru_cache, partial
+from typing import Optional, Any, Dict, Iterable, Iterator, List, Tuple
+from urllib.parse import urljoin
 
-from requests import RequestException, Session, Response
-from bs4 import BeautifulSoup
+from requests import HTTPError, RequestException, Session, Response, Timeout
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree, html as lxml_html
 
-from exceptions import ParserFindTagException
+from configs import configure_session
+from constants import (
+    DEFAULT_ENCODING, DOWNLOAD_CHUNK_SIZE, MAX_WORKERS, REQUEST_TIMEOUT,
+    STREAM_CHUNK_SIZE
+)
+from exceptions import FetchError, ParserFindTagException
 
+logger = logging.getLogger(__name__)
 
-def get_response(session: Session, url: str) -> Optional[Response]:
+HTML_PARSERS = threading.local()
+URL_SPECIAL_CHARS = frozenset('\t\r\n:;?#')
+
+_FOUND_TAGS: Dict[int, Dict[Tuple[str, Tuple], weakref.ref]] = {}
+
+_DEFAULT_SESSION: Optional[Session] = None
+_DEFAULT_SESSION_LOCK = threading.Lock()
+
+
+def _get_default_session() -> Session:
+    """
+    Return the module-wide session, creating it on first use.
+
+    The session is the same cached, connection-pooling session the parser
+    uses, so callers that do not manage their own session still reuse
+    cached pages and keep-alive connections.
+
+    Returns:
+        Session: The shared session object.
+    """
+    global _DEFAULT_SESSION
+    with _DEFAULT_SESSION_LOCK:
+        if _DEFAULT_SESSION is None:
+            _DEFAULT_SESSION = configure_session()
+    return _DEFAULT_SESSION
+
+
+@contextmanager
+def _raise_fetch_error(url: str) -> Iterator[None]:
+    """
+    Log a failure to load URL once and re-raise it as FetchError.
+
+    Timeouts and error statuses are logged as a single line, other
+    request errors with their traceback.
+    """
+    try:
+        yield
+    except Timeout as error:
+        logger.error('Timed out while loading the page %s', url)
+        raise FetchError(f'Timed out while loading the page {url}') from error
+    except HTTPError as error:
+        logger.error('Error status while loading the page %s: %s', url, error)
+        raise FetchError(
+            f'Error status while loading the page {url}: {error}'
+        ) from error
+    except RequestException as error:
+        logger.exception('An error occurred while loading the page %s', url)
+        raise FetchError(
+            f'An error occurred while loading the page {url}'
+        ) from error
+
+
+def get_response(session: Optional[Session], url: str) -> Response:
     """
     Send a GET request to URL using the given session.
 
+    Transient failures are retried by the session's adapter, see
+    configure_http_adapter, so an error here is final.
+
     Args:
-        session (Session): The session object for the request.
+        session (Optional[Session]): The session object for the request.
+            If None, the shared module-wide session is used.
         url (str): The target URL for the GET request.
 
     Returns:
-        Optional[Response]: Response object or None if an exception occurs.
+        Response: Successful response object. The body is left undecoded:
+        parse response.content in the charset given by get_charset.
+
+    Raises:
+        FetchError: If the page can not be loaded or the server responds
+            with an error status.
     """
+    if session is None:
+        session = _get_default_session()
+    with _raise_fetch_error(url):
+        response = session.get(
+            url, timeout=REQUEST_TIMEOUT, allow_redirects=True
+        )
+        response.raise_for_status()
+    return response
+
+
+def _get_response_or_none(
+        session: Optional[Session], url: str
+) -> Optional[Response]:
+    """Load a page for get_responses, turning a failure into None."""
     try:
-        response = session.get(url)
-        response.encoding = 'utf-8'
-        return response
-    except RequestException:
-        logging.exception(
-            f'An error occurred while loading the page {url}',
-            stack_info=True
+        return get_response(session, url)
+    except FetchError:
+        return None
+
+
+def get_responses(
+        session: Optional[Session],
+        urls: Iterable[str],
+        max_workers: int = MAX_WORKERS
+) -> Iterator[Optional[Response]]:
+    """
+    Send GET requests to several URLs concurrently using the given session.
+
+    The requests share the session's connection pool, which holds
+    MAX_WORKERS keep-alive connections per host. A page that fails to
+    load does not stop the others.
+
+    Args:
+        session (Optional[Session]): The session object for the requests.
+            If None, the shared module-wide session is used.
+        urls (Iterable[str]): The target URLs.
+        max_workers (int): Maximum number of requests in flight.
+
+    Yields:
+        Optional[Response]: Response objects in the order of urls,
+        None for pages that could not be loaded.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(partial(_get_response_or_none, session), urls)
+
+
+def download_file(session: Optional[Session], url: str, path: Path) -> None:
+    """
+    Stream a file from URL to disk in DOWNLOAD_CHUNK_SIZE chunks.
+
+    The body is written to a '.part' file next to path, which is renamed
+    to path only once the download is complete, so an interrupted
+    download never leaves a truncated file behind.
+
+    Args:
+        session (Optional[Session]): The session object for the request.
+            If None, the shared module-wide session is used.
+        url (str): The URL of the file.
+        path (Path): Where to save the file.
+
+    Raises:
+        FetchError: If the file can not be loaded or the server responds
+            with an error status.
+    """
+    if session is None:
+        session = _get_default_session()
+    part_path = path.with_name(path.name + '.part')
+    try:
+        with _raise_fetch_error(url), session.get(
+                url, stream=True, timeout=REQUEST_TIMEOUT
+        ) as response:
+            response.raise_for_status()
+            with open(part_path, 'wb') as file:
+                for chunk in response.iter_content(
+                        chunk_size=DOWNLOAD_CHUNK_SIZE
+                ):
+                    file.write(chunk)
+        part_path.replace(path)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+
+
+def iter_parse(
+        session: Optional[Session], url: str, tags: Tuple[str, ...]
+) -> Iterator[etree._Element]:
+    """
+    Load a page and yield elements with the given tags as they are parsed.
+
+    The body is fed to an incremental lxml parser in STREAM_CHUNK_SIZE
+    chunks, so stopping the iteration early leaves the rest of the page
+    unparsed. Each element is cleared, together with its preceding
+    siblings, once the caller asks for the next one. A caching session
+    reads the whole body into its cache before returning the response,
+    so the page is still downloaded and held in memory in full.
+
+    Args:
+        session (Optional[Session]): The session object for the request.
+            If None, the shared module-wide session is used.
+        url (str): The target URL for the GET request.
+        tags (Tuple[str, ...]): Names of the tags to yield.
+
+    Yields:
+        etree._Element: Fully parsed elements in document order.
+
+    Raises:
+        FetchError: If the page can not be loaded or the server responds
+            with an error status.
+    """
+    if session is None:
+        session = _get_default_session()
+    with _raise_fetch_error(url), session.get(
+            url, stream=True, timeout=REQUEST_TIMEOUT
+    ) as response:
+        response.raise_for_status()
+        parser = etree.HTMLPullParser(
+            events=('end',), tag=tags, encoding=get_charset(response)
         )
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            parser.feed(chunk)
+            yield from _release_parsed(parser)
+    parser.close()
+    yield from _release_parsed(parser)
+
+
+def _release_parsed(
+        parser: etree.HTMLPullParser
+) -> Iterator[etree._Element]:
+    """Yield parsed elements and free each one after it has been used."""
+    for _, element in parser.read_events():
+        yield element
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+
+def get_charset(response: Response) -> str:
+    """
+    Return the charset to decode a response body with.
+
+    The charset declared in the Content-Type header wins. Pages that do
+    not declare a known one are decoded as DEFAULT_ENCODING.
+
+    Args:
+        response (Response): The response to decode.
+
+    Returns:
+        str: Charset name.
+    """
+    message = Message()
+    message['Content-Type'] = response.headers.get('Content-Type', '')
+    charset = message.get_content_charset()
+    if charset and _is_known_charset(charset):
+        return charset
+    return DEFAULT_ENCODING
+
+
+@lru_cache(maxsize=64)
+def _is_known_charset(charset: str) -> bool:
+    """Tell whether both Python and lxml can decode the given charset."""
+    try:
+        codecs.lookup(charset)
+        etree.HTMLParser(encoding=charset)
+    except LookupError:
+        return False
+    return True
+
+
+def make_soup(
+        response: Response, parse_only: Optional[SoupStrainer] = None
+) -> BeautifulSoup:
+    """
+    Parse a response body with BeautifulSoup on top of the lxml parser.
+
+    The body is decoded in the charset given by get_charset.
+
+    Args:
+        response (Response): The response to parse.
+        parse_only (Optional[SoupStrainer]): Limits the tree to the matching
+            elements.
+
+    Returns:
+        BeautifulSoup: The parsed document.
+    """
+    return BeautifulSoup(
+        response.content, 'lxml',
+        parse_only=parse_only, from_encoding=get_charset(response)
+    )
+
+
+def make_tree(
+        content: bytes, encoding: str = DEFAULT_ENCODING
+) -> lxml_html.HtmlElement:
+    """
+    Parse an HTML document with a reusable lxml parser.
+
+    lxml parser instances must not be shared between threads, so each
+    thread builds a parser once per encoding and reuses it for every
+    later page in that encoding.
+
+    Args:
+        content (bytes): Raw HTML document.
+        encoding (str): Charset of the document, see get_charset.
+
+    Returns:
+        HtmlElement: Root element of the parsed document.
+    """
+    parsers = getattr(HTML_PARSERS, 'parsers', None)
+    if parsers is None:
+        parsers = HTML_PARSERS.parsers = {}
+    parser = parsers.get(encoding)
+    if parser is None:
+        parser = parsers[encoding] = lxml_html.HTMLParser(encoding=encoding)
+    return lxml_html.fromstring(content, parser=parser)
+
+
+def join_url(base: str, href: str) -> str:
+    """
+    Join a base URL with a link found on its page.
+
+    Plain relative paths like 'pep-0001/' are appended to a base ending
+    with '/' directly, skipping the cost of urljoin. Anything urljoin
+    would rewrite still goes through it: absolute and root- or
+    dot-relative links, './', '../' and empty segments, queries, fragments
+    and parameters, and links with surrounding spaces or control characters
+    or with tabs and newlines inside.
+
+    Args:
+        base (str): URL of the page the link was found on, normalized and
+            without a query or fragment like the parser's page URLs.
+        href (str): The link to resolve.
+
+    Returns:
+        str: The absolute URL.
+    """
+    if (
+        base.endswith('/') and href and href[0] not in '/.'
+        and href[0] > ' ' and href[-1] > ' '
+        and '/.' not in href and '//' not in href
+        and URL_SPECIAL_CHARS.isdisjoint(href)
+    ):
+        return base + href
+    return urljoin(base, href)
+
+
+def _attrs_key(attrs: Optional[Dict[str, Any]]) -> Optional[Tuple]:
+    """
+    Return a hashable form of search attributes or None if impossible.
+
+    Lists of accepted values are frozen into tuples, so such searches
+    share the matcher and result caches too. Compiled regex values are
+    hashable as they are.
+    """
+    if not attrs:
+        return ()
+    key = tuple(sorted(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in attrs.items()
+    ))
+    try:
+        hash(key)
+    except TypeError:
         return None
+    return key
+
+
+@lru_cache(maxsize=256)
+def _compiled_strainer(tag: str, attrs_key: Tuple) -> SoupStrainer:
+    """Build the tag matcher for a search once and reuse it for later ones."""
+    return SoupStrainer(tag, attrs=dict(attrs_key))
+
+
+def _remember_found_tag(
+        soup: BeautifulSoup, key: Tuple[str, Tuple], found: Any
+) -> None:
+    """
+    Remember a search result for the given tree.
+
+    Results are held by weak reference and the tree's entry is dropped
+    when the tree is garbage collected, so the cache never keeps parsed
+    pages alive and a reused object id never sees stale results.
+    """
+    soup_id = id(soup)
+    found_tags = _FOUND_TAGS.get(soup_id)
+    if found_tags is None:
+        found_tags = _FOUND_TAGS[soup_id] = {}
+        weakref.finalize(soup, _FOUND_TAGS.pop, soup_id, None)
+    found_tags[key] = weakref.ref(found)
 
 
 def find_tag(
@@ -36,6 +391,10 @@ def find_tag(
     """
     Search for the first tag with specified name and attributes.
 
+    The matcher for each distinct search is built once, and results are
+    memoized per tree, so repeated searches for the same tag and
+    attributes do not walk the tree again.
+
     Args:
         soup (BeautifulSoup): The BeautifulSoup object to search within.
         tag (str): The tag name to search for.
@@ -47,9 +406,142 @@ def find_tag(
     Raises:
         ParserFindTagException: If no matching tag is found.
     """
-    searched_tag = soup.find(tag, attrs=(attrs or {}))
+    attrs_key = _attrs_key(attrs)
+    if attrs_key is not None:
+        found_ref = _FOUND_TAGS.get(id(soup), {}).get((tag, attrs_key))
+        searched_tag = found_ref() if found_ref is not None else None
+        if searched_tag is not None:
+            return searched_tag
+
+    if attrs_key is None:
+        searched_tag = soup.find(tag, attrs=attrs)
+    else:
+        searched_tag = soup.find(_compiled_strainer(tag, attrs_key))
     if searched_tag is None:
-        error_msg = f'Tag {tag} {attrs} not found'
-        logging.error(error_msg, stack_info=True)
-        raise ParserFindTagException(error_msg)
+        logger.error('Tag %s %s not found', tag, attrs)
+        raise ParserFindTagException(f'Tag {tag} {attrs} not found')
+    if attrs_key is not None:
+        _remember_found_tag(soup, (tag, attrs_key), searched_tag)
     return searched_tag
+
+
+@lru_cache(maxsize=256)
+def _compiled_xpath(expr: str) -> etree.XPath:
+    """Compile an XPath expression once and reuse it for later lookups."""
+    return etree.XPath(expr)
+
+
+def find_by_xpath(
+        tree: lxml_html.HtmlElement, expr: str, **variables: Any
+) -> List[Any]:
+    """
+    Evaluate an XPath expression against an lxml tree.
+
+    Args:
+        tree (HtmlElement): The lxml element to search within.
+        expr (str): The XPath expression, compiled once per process.
+        **variables (Any): Values for $variables used in the expression.
+
+    Returns:
+        List[Any]: Matching elements or values.
+
+    Raises:
+        ParserFindTagException: If nothing matches the expression.
+    """
+    found = _compiled_xpath(expr)(tree, **variables)
+    if not found:
+        logger.error('Nothing found by XPath %s %s', expr, variables)
+        raise ParserFindTagException(
+            f'Nothing found by XPath {expr} {variables}'
+        )
+    return found
+
+
+@lru_cache(maxsize=256)
+def _element_xpath(tag: str, attr_names: Tuple[str, ...]) -> str:
+    """
+    Build the XPath for a tag with the given attributes.
+
+    Attribute values are passed as $value0, $value1... variables, so one
+    compiled expression serves every search with the same shape. A class
+    matches any of the element's classes, as in a CSS selector.
+    """
+    predicates = []
+    for index, name in enumerate(attr_names):
+        if name == 'class':
+            predicates.append(
+                'contains(concat(" ", normalize-space(@class), " "), '
+                f'concat(" ", $value{index}, " "))'
+            )
+        else:
+            predicates.append(f'@{name} = $value{index}')
+    return f'.//{tag}' + ''.join(f'[{predicate}]' for predicate in predicates)
+
+
+def find_element(
+        tree: lxml_html.HtmlElement,
+        tag: str,
+        attrs: Optional[Dict[str, str]] = None
+) -> lxml_html.HtmlElement:
+    """
+    Search an lxml tree for the first tag with specified name and attributes.
+
+    The lxml counterpart of find_tag: the search runs in C instead of
+    walking the tree in Python, through lxml's element iterator when only
+    a tag name is given and a compiled XPath expression otherwise.
+
+    Args:
+        tree (HtmlElement): The lxml element to search within.
+        tag (str): The tag name to search for.
+        attrs (Optional[Dict[str, str]]): Attribute values to match.
+
+    Returns:
+        HtmlElement: The first matching element found.
+
+    Raises:
+        ParserFindTagException: If no matching tag is found.
+    """
+    if not attrs:
+        found = next(tree.iterdescendants(tag), None)
+        if found is None:
+            logger.error('Tag %s not found', tag)
+            raise ParserFindTagException(f'Tag {tag} not found')
+        return found
+
+    attr_names = tuple(sorted(attrs))
+    return find_by_xpath(
+        tree,
+        _element_xpath(tag, attr_names),
+        **{
+            f'value{index}': attrs[name]
+            for index, name in enumerate(attr_names)
+        }
+    )[0]
+
+
+def parse_and_find(
+        response: Response, tag: str, attrs: Optional[Dict[str, Any]] = None
+) -> Any:
+    """
+    Parse only the elements matching a tag and return the first of them.
+
+    Nodes outside the matching elements are never built, which saves
+    time and memory when a single section of a page is needed.
+
+    Args:
+        response (Response): The response to parse.
+        tag (str): The tag name to search for.
+        attrs (Optional[Dict[str, Any]]): Attributes to match in the search.
+
+    Returns:
+        Any: The first matching tag found.
+
+    Raises:
+        ParserFindTagException: If no matching tag is found.
+    """
+    attrs_key = _attrs_key(attrs)
+    if attrs_key is None:
+        strainer = SoupStrainer(tag, attrs=attrs)
+    else:
+        strainer = _compiled_strainer(tag, attrs_key)
+    return find_tag(make_soup(response, strainer), tag, attrs)
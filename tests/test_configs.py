@@ -1,5 +1,10 @@
 import pytest
 import argparse
+import logging
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
 try:
     from src import configs
 except ModuleNotFoundError:
@@ -64,3 +69,104 @@ def test_configure_argument_parser(
     assert got_action.help == help_str, (
         f'Укажите help-строку cli аргумента {got_action.dest}'
     )
+
+
+@pytest.mark.parametrize('level, logger_level, has_stack', [
+    (logging.ERROR, logging.DEBUG, True),
+    (logging.ERROR, logging.INFO, False),
+    (logging.INFO, logging.DEBUG, False),
+])
+def test_stack_info_filter(level, logger_level, has_stack):
+    logger = logging.getLogger('test_stack_info_filter')
+    logger.setLevel(logger_level)
+    record = logger.makeRecord(
+        logger.name, level, __file__, 1, 'msg', None, None
+    )
+    assert configs.StackInfoFilter().filter(record), (
+        'Фильтр `StackInfoFilter` в модуле `configs.py` '
+        'не должен отбрасывать записи лога'
+    )
+    assert bool(record.stack_info) == has_stack, (
+        'Фильтр `StackInfoFilter` в модуле `configs.py` должен добавлять '
+        'стек вызовов только к записям уровня ERROR и выше '
+        'при включённом уровне DEBUG'
+    )
+    if has_stack:
+        assert 'test_stack_info_filter' in record.stack_info, (
+            'Стек вызовов должен содержать вызывающую функцию'
+        )
+
+
+def test_configure_dns_cache(monkeypatch):
+    lookups = []
+    slow_lookup_started = threading.Event()
+    slow_lookup_released = threading.Event()
+
+    def fake_getaddrinfo(host, port):
+        lookups.append(host)
+        if host == 'slow.example':
+            slow_lookup_started.set()
+            slow_lookup_released.wait(5)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', (host, port))]
+
+    monkeypatch.setattr(socket, 'getaddrinfo', fake_getaddrinfo)
+    configs.configure_dns_cache()
+    configs.configure_dns_cache()
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(
+            lambda _: socket.getaddrinfo('docs.python.org', 443), range(32)
+        ))
+    assert lookups == ['docs.python.org'], (
+        'Функция `configure_dns_cache` в модуле `configs.py` должна '
+        'разрешать имя хоста один раз для одновременных запросов'
+    )
+    assert all(result == results[0] for result in results), (
+        'Кешированный адрес хоста должен совпадать с полученным'
+    )
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        slow_lookup = executor.submit(
+            socket.getaddrinfo, 'slow.example', 443
+        )
+        assert slow_lookup_started.wait(5)
+        try:
+            socket.getaddrinfo('fast.example', 443)
+            assert not slow_lookup.done(), (
+                'Разрешение одного хоста не должно ждать '
+                'разрешения другого хоста'
+            )
+        finally:
+            slow_lookup_released.set()
+        slow_lookup.result(5)
+
+
+def test_configure_dns_cache_size(monkeypatch):
+    lookups = []
+    now = [0]
+
+    def fake_getaddrinfo(host, port):
+        lookups.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', (host, port))]
+
+    monkeypatch.setattr(socket, 'getaddrinfo', fake_getaddrinfo)
+    monkeypatch.setattr(configs, 'time', SimpleNamespace(
+        monotonic=lambda: now[0]
+    ))
+    monkeypatch.setattr(configs, 'DNS_CACHE_MAX_SIZE', 1)
+    configs.configure_dns_cache()
+
+    socket.getaddrinfo('docs.python.org', 443)
+    now[0] += configs.DNS_CACHE_TTL + 1
+    socket.getaddrinfo('docs.python.org', 443)
+    socket.getaddrinfo('peps.python.org', 443)
+    socket.getaddrinfo('peps.python.org', 443)
+    socket.getaddrinfo('docs.python.org', 443)
+    assert lookups == [
+        'docs.python.org', 'docs.python.org',
+        'peps.python.org', 'peps.python.org'
+    ], (
+        'Функция `configure_dns_cache` в модуле `configs.py` должна '
+        'обновлять устаревшие записи на месте и не кешировать '
+        'больше DNS_CACHE_MAX_SIZE записей'
+    )
@@ -1,4 +1,6 @@
+import io
 import pytest
+import requests_mock
 from pathlib import Path
 try:
     from src import main
@@ -112,6 +114,39 @@ def test_download(monkeypatch, tmp_path, mock_session):
     )
 
 
+class InterruptedBody(io.BytesIO):
+    """Body that breaks off after its first chunk."""
+
+    def read(self, *args, **kwargs):
+        if self.tell():
+            raise ConnectionResetError('Connection closed by server')
+        return super().read(1 << 16)
+
+
+def test_download_interrupted(monkeypatch, tmp_path, mock_session):
+    monkeypatch.setattr(main, 'BASE_DIR', Path(tmp_path))
+    archive_url = main.MAIN_DOC_URL + 'archives/python-docs-pdf-a4.zip'
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            main.MAIN_DOC_URL + 'download.html',
+            text=(
+                '<div role="main"><table class="docutils">'
+                f'<a href="{archive_url}">PDF</a></table></div>'
+            )
+        )
+        mock.get(archive_url, body=InterruptedBody(b'x' * (1 << 20)))
+        with pytest.raises(BaseException) as excinfo:
+            main.download(mock_session)
+    assert excinfo.typename == 'FetchError', (
+        'Функция `download` в модуле `main.py` при обрыве загрузки '
+        'должна выбросить исключение `FetchError`'
+    )
+    assert not list((Path(tmp_path) / 'downloads').iterdir()), (
+        'Функция `download` в модуле `main.py` не должна оставлять '
+        'недокачанный архив при обрыве загрузки'
+    )
+
+
 def test_mode_to_function():
     got = main.MODE_TO_FUNCTION
     assert isinstance(got, dict), (
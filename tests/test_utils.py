@@ -1,3 +1,4 @@
+import gc
 import pytest
 import requests
 import requests_mock
@@ -38,6 +39,35 @@ def test_find_tag_exception(soup):
     )
 
 
+def test_find_tag_cache(monkeypatch):
+    soup = bs4.BeautifulSoup(
+        '<div class="toctree-wrapper"><a href="3.12.html">3.12</a></div>',
+        'lxml'
+    )
+    found = utils.find_tag(soup, 'div', {'class': 'toctree-wrapper'})
+
+    def find_again(*args, **kwargs):
+        raise AssertionError('tree searched again')
+
+    monkeypatch.setattr(soup, 'find', find_again)
+    got = utils.find_tag(soup, 'div', {'class': 'toctree-wrapper'})
+    assert got is found, (
+        'Функция `find_tag` в модуле `utils.py` должна возвращать '
+        'сохранённый результат повторного поиска без обхода дерева'
+    )
+    soup_id = id(soup)
+    assert soup_id in utils._FOUND_TAGS, (
+        'Результаты поиска `find_tag` должны сохраняться для дерева'
+    )
+    del soup, found, got
+    monkeypatch.undo()
+    gc.collect()
+    assert soup_id not in utils._FOUND_TAGS, (
+        'Сохранённые результаты `find_tag` должны удаляться '
+        'вместе с деревом'
+    )
+
+
 def test_get_response(mock_session):
     with requests_mock.Mocker() as mock:
         mock.get(
@@ -54,3 +84,188 @@ def test_get_response(mock_session):
             'делает запрос к странице и возвращает ответ. \n'
             'Кстати: You are breathtaken!'
         )
+
+
+def test_get_response_fetch_error(mock_session):
+    with requests_mock.Mocker() as mock:
+        mock.get(MAIN_DOC_URL + 'missing_page/', status_code=404)
+        with pytest.raises(BaseException) as excinfo:
+            utils.get_response(mock_session, MAIN_DOC_URL + 'missing_page/')
+    assert excinfo.typename == 'FetchError', (
+        'Функция `get_response` в модуле `utils.py` в случае '
+        'ошибки загрузки страницы должна выбросить исключение `FetchError`'
+    )
+
+
+def test_iter_parse(mock_session):
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            MAIN_DOC_URL + 'pep_page/',
+            content=b'<dl><dt>Status</dt><dd>Final</dd>'
+                    b'<dt>Type</dt><dd>Process</dd></dl>'
+        )
+        mock.get(MAIN_DOC_URL + 'broken_page/', status_code=500)
+        elements = utils.iter_parse(
+            mock_session, MAIN_DOC_URL + 'pep_page/', ('dd',)
+        )
+        first = next(elements)
+        assert first.text == 'Final', (
+            'Функция `iter_parse` в модуле `utils.py` должна возвращать '
+            'элементы с заданными тегами по порядку'
+        )
+        elements.close()
+        assert next(elements, None) is None, (
+            'Функция `iter_parse` в модуле `utils.py` должна прекращать '
+            'разбор страницы, когда перебор остановлен'
+        )
+        with pytest.raises(BaseException) as excinfo:
+            next(utils.iter_parse(
+                mock_session, MAIN_DOC_URL + 'broken_page/', ('dd',)
+            ))
+    assert excinfo.typename == 'FetchError', (
+        'Функция `iter_parse` в модуле `utils.py` в случае '
+        'ошибки загрузки страницы должна выбросить исключение `FetchError`'
+    )
+
+
+def test_download_file(mock_session, tmp_path):
+    path = tmp_path / 'archive.zip'
+    with requests_mock.Mocker() as mock:
+        mock.get(MAIN_DOC_URL + 'archive.zip', content=b'PK archive')
+        mock.get(MAIN_DOC_URL + 'missing.zip', status_code=404)
+        utils.download_file(mock_session, MAIN_DOC_URL + 'archive.zip', path)
+        assert path.read_bytes() == b'PK archive', (
+            'Функция `download_file` в модуле `utils.py` должна '
+            'сохранять файл по заданному пути'
+        )
+        with pytest.raises(BaseException) as excinfo:
+            utils.download_file(
+                mock_session, MAIN_DOC_URL + 'missing.zip',
+                tmp_path / 'missing.zip'
+            )
+    assert excinfo.typename == 'FetchError', (
+        'Функция `download_file` в модуле `utils.py` в случае '
+        'ошибки загрузки файла должна выбросить исключение `FetchError`'
+    )
+    assert [file.name for file in tmp_path.iterdir()] == ['archive.zip'], (
+        'Функция `download_file` в модуле `utils.py` не должна оставлять '
+        'файлы при ошибке загрузки'
+    )
+
+
+@pytest.mark.parametrize('base, href, expected', [
+    (
+        'https://peps.python.org/', 'pep-0001/',
+        'https://peps.python.org/pep-0001/'
+    ),
+    (
+        'https://docs.python.org/3/whatsnew/', '3.12.html',
+        'https://docs.python.org/3/whatsnew/3.12.html'
+    ),
+    (
+        'https://docs.python.org/3/whatsnew/', '../download.html',
+        'https://docs.python.org/3/download.html'
+    ),
+    (
+        'https://docs.python.org/3/whatsnew/', '/dev/peps/',
+        'https://docs.python.org/dev/peps/'
+    ),
+    (
+        'https://peps.python.org/', 'https://www.python.org/',
+        'https://www.python.org/'
+    ),
+    (
+        'https://docs.python.org/3/download.html', 'archives/docs.zip',
+        'https://docs.python.org/3/archives/docs.zip'
+    ),
+    ('https://x.org/a/', 'b/../c', 'https://x.org/a/c'),
+    ('https://x.org/a/', 'b/./c', 'https://x.org/a/b/c'),
+    ('https://x.org/a/', 'b//c', 'https://x.org/a/b/c'),
+    ('https://x.org/a/', ' pep', 'https://x.org/a/pep'),
+    ('https://x.org/a/', 'pe\tp', 'https://x.org/a/pep'),
+    ('https://x.org/a/', 'pep?', 'https://x.org/a/pep'),
+    ('https://x.org/a/', 'pep#', 'https://x.org/a/pep'),
+    ('https://x.org/a/', ';', 'https://x.org/a/'),
+])
+def test_join_url(base, href, expected):
+    got = utils.join_url(base, href)
+    assert got == expected, (
+        'Функция `join_url` в модуле `utils.py` должна возвращать '
+        f'тот же адрес, что и `urljoin`: {expected}'
+    )
+
+
+def test_find_by_xpath():
+    tree = utils.make_tree(
+        b'<html><body><section id="numerical-index">'
+        b'<a href="pep-0001/">1</a></section></body></html>'
+    )
+    got = utils.find_by_xpath(tree, '//section[@id="numerical-index"]//a')
+    assert len(got) == 1 and got[0].get('href') == 'pep-0001/', (
+        'Функция `find_by_xpath` в модуле `utils.py` должна возвращать '
+        'список найденных элементов'
+    )
+    with pytest.raises(BaseException) as excinfo:
+        utils.find_by_xpath(tree, '//unexpected')
+    assert excinfo.typename == 'ParserFindTagException', (
+        'Функция `find_by_xpath` в модуле `utils.py` в случае '
+        'отсутствия искомых элементов '
+        'должна выбросить исключение `ParserFindTagException`'
+    )
+
+
+def test_find_element():
+    tree = utils.make_tree(
+        b'<html><body><div class="toctree-wrapper compound">'
+        b'<section id="what-s-new-in-python"><h1>New</h1></section>'
+        b'</div></body></html>'
+    )
+    got = utils.find_element(tree, 'div', {'class': 'toctree-wrapper'})
+    assert got.get('class') == 'toctree-wrapper compound', (
+        'Функция `find_element` в модуле `utils.py` должна находить тег '
+        'по одному из его классов'
+    )
+    got = utils.find_element(
+        tree, 'section', {'id': 'what-s-new-in-python'}
+    )
+    assert got.findtext('h1') == 'New', (
+        'Функция `find_element` в модуле `utils.py` должна возвращать '
+        'первый тег с заданными атрибутами'
+    )
+    with pytest.raises(BaseException) as excinfo:
+        utils.find_element(tree, 'div', {'class': 'toctree'})
+    assert excinfo.typename == 'ParserFindTagException', (
+        'Функция `find_element` в модуле `utils.py` в случае '
+        'отсутствия искомого тэга '
+        'должна выбросить исключение `ParserFindTagException`'
+    )
+
+
+@pytest.mark.parametrize('content_type, expected', [
+    ('text/html', 'utf-8'),
+    ('text/html; charset=windows-1251', 'windows-1251'),
+    ('text/html; charset="KOI8-R"', 'koi8-r'),
+    ('text/html; charset=unknown-charset', 'utf-8'),
+])
+def test_get_charset(content_type, expected):
+    response = requests.models.Response()
+    response.headers['Content-Type'] = content_type
+    got = utils.get_charset(response)
+    assert got == expected, (
+        'Функция `get_charset` в модуле `utils.py` должна возвращать '
+        'кодировку из заголовка `Content-Type` или `utf-8`'
+    )
+
+
+@pytest.mark.parametrize('encoding', ['utf-8', 'windows-1251'])
+def test_make_tree_encoding(encoding):
+    text = 'Что нового в Python'
+    tree = utils.make_tree(
+        f'<html><body><h1>{text}</h1></body></html>'.encode(encoding),
+        encoding
+    )
+    got = utils.find_element(tree, 'h1').text_content()
+    assert got == text, (
+        'Функция `make_tree` в модуле `utils.py` должна декодировать '
+        'страницу без `<meta charset>` в заданной кодировке'
+    )